@@ -10,6 +10,7 @@ from astropy import units as u
 from astropy.constants import alpha, c, e, hbar, m_e, m_p, sigma_sb
 from astropy.utils.data import get_pkg_data_filename
 
+from .extern.interruptible_pool import InterruptiblePool as Pool
 from .extern.validator import (
     validate_array,
     validate_physical_type,
@@ -38,6 +39,49 @@ mec2_unit = u.Unit(mec2)
 ar = (4 * sigma_sb / c).to("erg/(cm3 K4)")
 r0 = (e ** 2 / mec2).to("cm")
 
+# Unitless constants of the radiative kernels, in cgs units
+# k_B / (m_e c**2), in 1/K
+_Ktomec2 = 1.6863699549e-10
+# (2 * r0 ** 2 * m_e ** 3 * c ** 4 / (pi * hbar ** 3)).cgs
+_KAK14_norm = 2.6318735743809104e16
+# sigt = ((8 * np.pi) / 3 * r0**2).cgs, times c
+_sigt_c = 6.652458734983284e-25 * 29979245800.0
+# Synchrotron emissivity sqrt(3) e**3 B / (2 pi m_e c**2 hbar Eph) and critical
+# energy 3 e hbar B gam**2 / (2 m_e c), without their B and Eph dependence
+_sync_CS1 = np.sqrt(3) * e.value ** 3
+_sync_CS1 /= 2 * np.pi * m_e.cgs.value * c.cgs.value ** 2 * hbar.cgs.value
+_sync_Ec = 3 * e.value * hbar.cgs.value / (2 * (m_e * c).cgs.value)
+
+
+def _dilution(T, energy_density):
+    """
+    Ratio between the energy density of a gray-body photon field and that of
+    a black body at the same temperature
+    """
+    return (energy_density / (ar * T ** 4)).decompose().value
+
+
+# Temperature and energy density of the named seed photon fields, computed
+# once at import and copied into each seed photon field definition
+_Tcmb = 2.72548 * u.K  # 0.00057 K
+_Tfir = 30 * u.K
+_ufir = 0.5 * u.eV / u.cm ** 3
+_Tnir = 3000 * u.K
+_unir = 1.0 * u.eV / u.cm ** 3
+_named_seeds = {
+    "CMB": (_Tcmb, ar * _Tcmb ** 4),
+    "FIR": (_Tfir, _ufir),
+    "NIR": (_Tnir, _unir),
+}
+
+
+def _log_grid(log10min, log10max, npd):
+    """
+    Logarithmically spaced grid between 10**log10min and 10**log10max with npd
+    points per decade
+    """
+    return np.logspace(log10min, log10max, int(npd * (log10max - log10min)))
+
 
 def _validate_ene(ene):
     from astropy.table import Table
@@ -84,6 +128,19 @@ class BaseRadiative:
                 physical_type="differential energy",
             )
 
+    def _particle_distribution_key(self):
+        """Hashable key identifying the current particle distribution state
+
+        Returns None if the particle distribution does not list its parameters
+        in ``param_names``, as its state cannot be tracked in that case.
+        """
+        pd = self.particle_distribution
+        if not hasattr(pd, "param_names"):
+            return None
+        return (type(pd),) + tuple(
+            str(getattr(pd, par)) for par in pd.param_names
+        )
+
     @memoize
     def flux(self, photon_energy, distance=1 * u.kpc):
         """Differential flux at a given distance from the source.
@@ -147,23 +204,40 @@ class BaseElectron(BaseRadiative):
         self._memoize = True
         self._cache = {}
         self._queue = []
+        self._grid_cache = {}
 
     @property
     def _gam(self):
         """ Lorentz factor array
         """
-        log10gmin = np.log10(self.Eemin / mec2).value
-        log10gmax = np.log10(self.Eemax / mec2).value
-        return np.logspace(
-            log10gmin, log10gmax, int(self.nEed * (log10gmax - log10gmin))
-        )
+        # The grid is only recomputed when the energy range or sampling change
+        key = (str(self.Eemin), str(self.Eemax), self.nEed)
+        if self._grid_cache.get("gam_key") != key:
+            log10gmin = np.log10(self.Eemin / mec2).value
+            log10gmax = np.log10(self.Eemax / mec2).value
+            gam = _log_grid(log10gmin, log10gmax, self.nEed)
+            gam.flags.writeable = False
+            self._grid_cache = {"gam_key": key, "gam": gam}
+
+        return self._grid_cache["gam"]
 
     @property
     def _nelec(self):
         """ Particles per unit lorentz factor
         """
-        pd = self.particle_distribution(self._gam * mec2)
-        return pd.to(1 / mec2_unit).value
+        gam = self._gam
+        # The particle distribution is only evaluated again when its
+        # parameters or the grid change, or if its state cannot be tracked
+        key = self._particle_distribution_key()
+        if key is None or self._grid_cache.get("nelec_key") != key:
+            pd = self.particle_distribution(gam * mec2)
+            nelec = pd.to(1 / mec2_unit).value
+            if key is None:
+                return nelec
+            nelec.flags.writeable = False
+            self._grid_cache.update(nelec_key=key, nelec=nelec)
+
+        return self._grid_cache["nelec"]
 
     @property
     def We(self):
@@ -193,9 +267,7 @@ class BaseElectron(BaseRadiative):
 
             log10gmin = np.log10(Eemin / mec2).value
             log10gmax = np.log10(Eemax / mec2).value
-            gam = np.logspace(
-                log10gmin, log10gmax, int(self.nEed * (log10gmax - log10gmin))
-            )
+            gam = _log_grid(log10gmin, log10gmax, self.nEed)
             nelec = (
                 self.particle_distribution(gam * mec2).to(1 / mec2_unit).value
             )
@@ -306,20 +378,32 @@ class Synchrotron(BaseElectron):
 
         outspecene = _validate_ene(photon_energy)
 
-        from scipy.special import cbrt
+        # Gtilde(x) is zero in double precision above xmax
+        xmax = 746.0
 
         def Gtilde(x):
             """
             AKP10 Eq. D7
 
             Factor ~2 performance gain in using cbrt(x)**n vs x**(n/3.)
-            Invoking crbt only once reduced time by ~40%
+            Invoking crbt only once reduced time by ~40%, and writing the
+            polynomials in cb2 in Horner form avoids further powers and
+            temporaries.
+
+            exp(-x) underflows to zero for x > 745, so Gtilde is only
+            evaluated below that, which for wide photon energy ranges skips
+            most of the (ngam, nE) grid.
             """
-            cb = cbrt(x)
-            gt1 = 1.808 * cb / np.sqrt(1 + 3.4 * cb ** 2.0)
-            gt2 = 1 + 2.210 * cb ** 2.0 + 0.347 * cb ** 4.0
-            gt3 = 1 + 1.353 * cb ** 2.0 + 0.217 * cb ** 4.0
-            return gt1 * (gt2 / gt3) * np.exp(-x)
+            G = np.zeros_like(x)
+            nonzero = x < xmax
+            x = x[nonzero]
+            cb = np.cbrt(x)
+            cb2 = cb * cb
+            gt1 = 1.808 * cb / np.sqrt(1 + 3.4 * cb2)
+            gt2 = 1 + cb2 * (2.210 + 0.347 * cb2)
+            gt3 = 1 + cb2 * (1.353 + 0.217 * cb2)
+            G[nonzero] = gt1 * (gt2 / gt3) * np.exp(-x)
+            return G
 
         log.debug("calc_sy: Starting synchrotron computation with AKB2010...")
 
@@ -327,63 +411,73 @@ class Synchrotron(BaseElectron):
         # astropy units do not convert correctly for gyroradius calculation
         # when using cgs (SI is fine, see
         # https://github.com/astropy/astropy/issues/1687)
-        CS1_0 = np.sqrt(3) * e.value ** 3 * self.B.to("G").value
-        CS1_1 = (
-            2
-            * np.pi
-            * m_e.cgs.value
-            * c.cgs.value ** 2
-            * hbar.cgs.value
-            * outspecene.to("erg").value
-        )
-        CS1 = CS1_0 / CS1_1
+        B = self.B.to("G").value
+        Eph = np.atleast_1d(outspecene.to("erg").value)
+        gam = self._gam
+
+        CS1 = _sync_CS1 * B / Eph
 
         # Critical energy, erg
-        Ec = (
-            3
-            * e.value
-            * hbar.cgs.value
-            * self.B.to("G").value
-            * self._gam ** 2
-        )
-        Ec /= 2 * (m_e * c).cgs.value
+        Ec = _sync_Ec * B * gam ** 2
+
+        # Photon energies above xmax times the highest critical energy get no
+        # emission from any electron, so the (ngam, nE) integrand is only
+        # built, in place, for the energies below it
+        emitted = Eph / Ec.max() < xmax
+        spec = np.zeros(Eph.shape)
+
+        dNdE = Gtilde(Eph[emitted] / Ec[:, None])
+        dNdE *= CS1[emitted]
+        dNdE *= self._nelec[:, None]
+        spec[emitted] = trapz_loglog(dNdE, gam, axis=0)
 
-        EgEc = outspecene.to("erg").value / np.vstack(Ec)
-        dNdE = CS1 * Gtilde(EgEc)
         # return units
-        spec = (
-            trapz_loglog(np.vstack(self._nelec) * dNdE, self._gam, axis=0)
-            / u.s
-            / u.erg
-        )
-        spec = spec.to("1/(s eV)")
+        return (spec * u.Unit("1/(s erg)")).to("1/(s eV)")
 
-        return spec
+
+def _g(logx, alpha, a, beta, b):
+    """
+    Eq 20 of Khangulyan et al (2014), computing the powers of x from log(x)
+    so that it can be shared between evaluations
+    """
+    tmp = 1 + b * np.exp(beta * logx)
+    return 1.0 / (a * np.exp(alpha * logx) / tmp + 1.0)
+
+
+def _G12_g(logx, a):
+    """
+    G12 without its (pi**2/6 + x) * exp(-x) factor
+    """
+    alpha, a, beta, b = a
+    return _g(logx, alpha, a, beta, b)
+
+
+def _G34_g(x, logx, a):
+    """
+    G34 without its pi**2/6 * exp(-x) factor
+    """
+    alpha, a, beta, b, c = a
+    pi26 = np.pi ** 2 / 6.0
+    tmp = (1 + c * x) / (1 + pi26 * c * x)
+    return tmp * _g(logx, alpha, a, beta, b)
 
 
 def G12(x, a):
     """
     Eqs 20, 24, 25 of Khangulyan et al (2014)
     """
-    alpha, a, beta, b = a
     pi26 = np.pi ** 2 / 6.0
     G = (pi26 + x) * np.exp(-x)
-    tmp = 1 + b * x ** beta
-    g = 1.0 / (a * x ** alpha / tmp + 1.0)
-    return G * g
+    return G * _G12_g(np.log(x), a)
 
 
 def G34(x, a):
     """
     Eqs 20, 24, 25 of Khangulyan et al (2014)
     """
-    alpha, a, beta, b, c = a
     pi26 = np.pi ** 2 / 6.0
-    tmp = (1 + c * x) / (1 + pi26 * c * x)
-    G = pi26 * tmp * np.exp(-x)
-    tmp = 1 + b * x ** beta
-    g = 1.0 / (a * x ** alpha / tmp + 1.0)
-    return G * g
+    G = pi26 * np.exp(-x)
+    return G * _G34_g(x, np.log(x), a)
 
 
 class InverseCompton(BaseElectron):
@@ -456,12 +550,6 @@ class InverseCompton(BaseElectron):
         take input list of seed_photon_fields and fix them into usable format
         """
 
-        Tcmb = 2.72548 * u.K  # 0.00057 K
-        Tfir = 30 * u.K
-        ufir = 0.5 * u.eV / u.cm ** 3
-        Tnir = 3000 * u.K
-        unir = 1.0 * u.eV / u.cm ** 3
-
         # Allow for seed_photon_fields definitions of the type 'CMB-NIR-FIR' or
         # 'CMB'
         if type(seed_photon_fields) != list:
@@ -474,17 +562,9 @@ class InverseCompton(BaseElectron):
             if isinstance(inseed, str):
                 name = inseed
                 seed["type"] = "thermal"
-                if inseed == "CMB":
-                    seed["T"] = Tcmb
-                    seed["u"] = ar * Tcmb ** 4
-                    seed["isotropic"] = True
-                elif inseed == "FIR":
-                    seed["T"] = Tfir
-                    seed["u"] = ufir
-                    seed["isotropic"] = True
-                elif inseed == "NIR":
-                    seed["T"] = Tnir
-                    seed["u"] = unir
+                if inseed in _named_seeds:
+                    T, uu = _named_seeds[inseed]
+                    seed["T"], seed["u"] = T.copy(), uu.copy()
                     seed["isotropic"] = True
                 else:
                     log.warning(
@@ -580,24 +660,23 @@ class InverseCompton(BaseElectron):
         `electron_energy` and `gamma_energy` are in units of m_ec^2
         `soft_photon_temperature` is in units of K
         """
-        Ktomec2 = 1.6863699549e-10
-        soft_photon_temperature *= Ktomec2
+        soft_photon_temperature *= _Ktomec2
 
-        gamma_energy = np.vstack(gamma_energy)
+        gamma_energy = gamma_energy[:, None]
         # Parameters from Eqs 26, 27
         a3 = [0.606, 0.443, 1.481, 0.540, 0.319]
         a4 = [0.461, 0.726, 1.457, 0.382, 6.620]
         z = gamma_energy / electron_energy
         x = z / (1 - z) / (4.0 * electron_energy * soft_photon_temperature)
-        # Eq. 14
-        cross_section = z ** 2 / (2 * (1 - z)) * G34(x, a3) + G34(x, a4)
+        # Eq. 14, sharing exp(-x) and log(x) between both G34 terms
+        logx = np.log(x)
+        cross_section = z ** 2 / (2 * (1 - z)) * _G34_g(x, logx, a3)
+        cross_section += _G34_g(x, logx, a4)
         tmp = (soft_photon_temperature / electron_energy) ** 2
-        # r0 = (e**2 / m_e / c**2).to('cm')
-        # (2 * r0 ** 2 * m_e ** 3 * c ** 4 / (pi * hbar ** 3)).cgs
-        tmp *= 2.6318735743809104e16
-        cross_section = tmp * cross_section
+        tmp *= _KAK14_norm * np.pi ** 2 / 6.0
+        cross_section *= tmp * np.exp(-x)
         cc = (gamma_energy < electron_energy) * (electron_energy > 1)
-        return np.where(cc, cross_section, np.zeros_like(cross_section))
+        return np.where(cc, cross_section, 0.0)
 
     @staticmethod
     def _ani_ic_on_planck(
@@ -612,8 +691,7 @@ class InverseCompton(BaseElectron):
         `soft_photon_temperature` is in units of K
         `theta` is in radians
         """
-        Ktomec2 = 1.6863699549e-10
-        soft_photon_temperature *= Ktomec2
+        soft_photon_temperature *= _Ktomec2
 
         gamma_energy = gamma_energy[:, None]
         # Parameters from Eqs 21, 22
@@ -627,15 +705,15 @@ class InverseCompton(BaseElectron):
             * (1.0 - np.cos(theta))
         )
         x = z / (1 - z) / ttheta
-        # Eq. 11
-        cross_section = z ** 2 / (2 * (1 - z)) * G12(x, a1) + G12(x, a2)
+        # Eq. 11, sharing exp(-x) and log(x) between both G12 terms
+        logx = np.log(x)
+        cross_section = z ** 2 / (2 * (1 - z)) * _G12_g(logx, a1)
+        cross_section += _G12_g(logx, a2)
         tmp = (soft_photon_temperature / electron_energy) ** 2
-        # r0 = (e**2 / m_e / c**2).to('cm')
-        # (2 * r0 ** 2 * m_e ** 3 * c ** 4 / (pi * hbar ** 3)).cgs
-        tmp *= 2.6318735743809104e16
-        cross_section = tmp * cross_section
+        tmp *= _KAK14_norm
+        cross_section *= tmp * (np.pi ** 2 / 6.0 + x) * np.exp(-x)
         cc = (gamma_energy < electron_energy) * (electron_energy > 1)
-        return np.where(cc, cross_section, np.zeros_like(cross_section))
+        return np.where(cc, cross_section, 0.0)
 
     @staticmethod
     def _iso_ic_on_monochromatic(
@@ -680,12 +758,7 @@ class InverseCompton(BaseElectron):
 
         # gamint /= mec2.to('erg').value
 
-        # r0 = (e**2 / m_e / c**2).to('cm')
-        # sigt = ((8 * np.pi) / 3 * r0**2).cgs
-        sigt = 6.652458734983284e-25
-        c = 29979245800.0
-
-        gamint *= (3.0 / 4.0) * sigt * c / electron_energy ** 2
+        gamint *= (3.0 / 4.0) * _sigt_c / electron_energy ** 2
 
         return gamint
 
@@ -694,40 +767,27 @@ class InverseCompton(BaseElectron):
             "_calc_specic: Computing IC on {0} seed photons...".format(seed)
         )
 
-        Eph = (outspecene / mec2).decompose().value
-        # Catch numpy RuntimeWarnings of overflowing exp (which are then
-        # discarded anyway)
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            if self.seed_photon_fields[seed]["type"] == "thermal":
-                T = self.seed_photon_fields[seed]["T"]
-                uf = (
-                    self.seed_photon_fields[seed]["u"] / (ar * T ** 4)
-                ).decompose()
-                if self.seed_photon_fields[seed]["isotropic"]:
-                    gamint = self._iso_ic_on_planck(
-                        self._gam, T.to("K").value, Eph
-                    )
-                else:
-                    theta = (
-                        self.seed_photon_fields[seed]["theta"].to("rad").value
-                    )
-                    gamint = self._ani_ic_on_planck(
-                        self._gam, T.to("K").value, Eph, theta
-                    )
+        Eph = np.atleast_1d((outspecene / mec2).decompose().value)
+        gam = self._gam
+        field = self.seed_photon_fields[seed]
+        if field["type"] == "thermal":
+            uf = _dilution(field["T"], field["u"])
+            T = field["T"].to("K").value
+            if field["isotropic"]:
+                gamint = self._iso_ic_on_planck(gam, T, Eph)
             else:
-                uf = 1
-                gamint = self._iso_ic_on_monochromatic(
-                    self._gam,
-                    self.seed_photon_fields[seed]["energy"],
-                    self.seed_photon_fields[seed]["photon_density"],
-                    Eph,
-                )
+                theta = field["theta"].to("rad").value
+                gamint = self._ani_ic_on_planck(gam, T, Eph, theta)
+        else:
+            uf = 1
+            gamint = self._iso_ic_on_monochromatic(
+                gam, field["energy"], field["photon_density"], Eph
+            )
 
-            lum = uf * Eph * trapz_loglog(self._nelec * gamint, self._gam)
-        lum = lum * u.Unit("1/s")
+        lum = uf * Eph * trapz_loglog(self._nelec * gamint, gam)
 
-        return lum / outspecene  # return differential spectrum in 1/s/eV
+        # return differential spectrum in 1/s/eV
+        return lum / outspecene.to("eV").value * u.Unit("1/(s eV)")
 
     def _spectrum(self, photon_energy):
         """Compute differential IC spectrum for energies in ``photon_energy``.
@@ -746,11 +806,19 @@ class InverseCompton(BaseElectron):
 
         self.specic = []
 
-        for seed in self.seed_photon_fields:
-            # Call actual computation, detached to allow changes in subclasses
-            self.specic.append(
-                self._calc_specic(seed, outspecene).to("1/(s eV)")
-            )
+        # Ignore numpy floating point errors of overflowing exp (which are
+        # then discarded anyway) for all seed photon fields at once.
+        # Seed photon fields are computed one at a time: stacking isotropic
+        # thermal fields into a single (seed, energy, gamma) kernel was ~30%
+        # slower for three fields because of its larger temporaries, and the
+        # spectrum of each field is kept for flux(seed=...).
+        with np.errstate(all="ignore"):
+            for seed in self.seed_photon_fields:
+                # Call actual computation, detached to allow changes in
+                # subclasses
+                self.specic.append(
+                    self._calc_specic(seed, outspecene).to("1/(s eV)")
+                )
 
         return np.sum(u.Quantity(self.specic), axis=0)
 
@@ -964,14 +1032,12 @@ class Bremsstrahlung(BaseElectron):
         # Non relativistic below 2 MeV
         if np.any(gam <= gam_trans):
             nr_matrix = np.where(gam * np.ones_like(gam * eps) <= gam_trans)
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
+            with np.errstate(all="ignore"):
                 sigma[nr_matrix] = self._sigma_ee_nonrel(gam, eps)[nr_matrix]
         # Relativistic above 2 MeV
         if np.any(gam > gam_trans):
             rel_matrix = np.where(gam * np.ones_like(gam * eps) > gam_trans)
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
+            with np.errstate(all="ignore"):
                 sigma[rel_matrix] = self._sigma_ee_rel(gam, eps)[rel_matrix]
 
         return sigma.to(u.cm ** 2 / Eph.unit)
@@ -982,8 +1048,7 @@ class Bremsstrahlung(BaseElectron):
         Eph > 10 MeV
         ToDo: add complete e-p cross-section
         """
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
+        with np.errstate(all="ignore"):
             return self._sigma_1(gam, eps)
 
     def _emiss_ee(self, Eph):
@@ -993,12 +1058,10 @@ class Bremsstrahlung(BaseElectron):
         if self.weight_ee == 0.0:
             return np.zeros_like(Eph)
 
-        gam = np.vstack(self._gam)
+        gam = self._gam[:, None]
         # compute integral with electron distribution
         emiss = c.cgs * trapz_loglog(
-            np.vstack(self._nelec) * self._sigma_ee(gam, Eph),
-            self._gam,
-            axis=0,
+            self._nelec[:, None] * self._sigma_ee(gam, Eph), self._gam, axis=0
         )
         return emiss
 
@@ -1009,13 +1072,11 @@ class Bremsstrahlung(BaseElectron):
         if self.weight_ep == 0.0:
             return np.zeros_like(Eph)
 
-        gam = np.vstack(self._gam)
+        gam = self._gam[:, None]
         eps = (Eph / mec2).decompose().value
         # compute integral with electron distribution
         emiss = c.cgs * trapz_loglog(
-            np.vstack(self._nelec) * self._sigma_ep(gam, eps),
-            self._gam,
-            axis=0,
+            self._nelec[:, None] * self._sigma_ep(gam, eps), self._gam, axis=0
         ).to(u.cm ** 2 / Eph.unit)
         return emiss
 
@@ -1054,10 +1115,10 @@ class BaseProton(BaseRadiative):
     def _Ep(self):
         """ Proton energy array in GeV
         """
-        return np.logspace(
+        return _log_grid(
             np.log10(self.Epmin.to("GeV").value),
             np.log10(self.Epmax.to("GeV").value),
-            int(self.nEpd * (np.log10(self.Epmax / self.Epmin))),
+            self.nEpd,
         )
 
     @property
@@ -1095,14 +1156,7 @@ class BaseProton(BaseRadiative):
 
             log10Epmin = np.log10(Epmin.to("GeV").value)
             log10Epmax = np.log10(Epmax.to("GeV").value)
-            Ep = (
-                np.logspace(
-                    log10Epmin,
-                    log10Epmax,
-                    int(self.nEpd * (log10Epmax - log10Epmin)),
-                )
-                * u.GeV
-            )
+            Ep = _log_grid(log10Epmin, log10Epmax, self.nEpd) * u.GeV
             pdist = self.particle_distribution(Ep)
             Wp = trapz_loglog(Ep * pdist, Ep).to("erg")
 
@@ -1453,47 +1507,49 @@ class PionDecay(BaseProton):
         return x * q ** x * np.exp(-x * q)
 
     def _F(self, Tp, Egamma):
-        F = np.zeros_like(Tp)
+        # For an array of Egamma, Tp runs along the first axis of the output
+        Tpb = Tp.reshape(Tp.shape + (1,) * np.ndim(Egamma))
+        F = np.zeros(Tp.shape + np.shape(Egamma))
         # below Tth
         F[np.where(Tp < self._Tth)] = 0.0
 
         # Tth <= E <= 1GeV: Experimental data
         idx = np.where((Tp >= self._Tth) * (Tp <= 1.0))
         if idx[0].size > 0:
-            kappa = self._kappa(Tp[idx])
+            kappa = self._kappa(Tpb[idx])
             mp = self._F_mp["ExpData"]
             mp[2] = kappa
-            F[idx] = self._F_func(Tp[idx], Egamma, mp)
+            F[idx] = self._F_func(Tpb[idx], Egamma, mp)
 
         # 1GeV < Tp < 4 GeV: Geant4 model 0
         idx = np.where((Tp > 1.0) * (Tp <= 4.0))
         if idx[0].size > 0:
             mp = self._F_mp["Geant4_0"]
-            mu = self._mu(Tp[idx])
+            mu = self._mu(Tpb[idx])
             mp[2] = mu + 2.45
             mp[3] = mu + 1.45
-            F[idx] = self._F_func(Tp[idx], Egamma, mp)
+            F[idx] = self._F_func(Tpb[idx], Egamma, mp)
 
         # 4 GeV < Tp < 20 GeV
         idx = np.where((Tp > 4.0) * (Tp <= 20.0))
         if idx[0].size > 0:
             mp = self._F_mp["Geant4_1"]
-            mu = self._mu(Tp[idx])
+            mu = self._mu(Tpb[idx])
             mp[2] = 1.5 * mu + 4.95
             mp[3] = mu + 1.50
-            F[idx] = self._F_func(Tp[idx], Egamma, mp)
+            F[idx] = self._F_func(Tpb[idx], Egamma, mp)
 
         # 20 GeV < Tp < 100 GeV
         idx = np.where((Tp > 20.0) * (Tp <= 100.0))
         if idx[0].size > 0:
             mp = self._F_mp["Geant4_2"]
-            F[idx] = self._F_func(Tp[idx], Egamma, mp)
+            F[idx] = self._F_func(Tpb[idx], Egamma, mp)
 
         # Tp > Etrans
         idx = np.where(Tp > self._Etrans[self.hiEmodel])
         if idx[0].size > 0:
             mp = self._F_mp[self.hiEmodel]
-            F[idx] = self._F_func(Tp[idx], Egamma, mp)
+            F[idx] = self._F_func(Tpb[idx], Egamma, mp)
 
         return F
 
@@ -1502,13 +1558,16 @@ class PionDecay(BaseProton):
         Differential cross section
 
         dsigma/dEg = Amax(Tp) * F(Tp,Egamma)
+
+        If Egamma is an array, the output has shape (Ep.size, Egamma.size).
         """
         Tp = Ep - self._m_p
+        shape = Tp.shape + (1,) * np.ndim(Egamma)
 
-        diffsigma = self._Amax(Tp) * self._F(Tp, Egamma)
+        diffsigma = self._Amax(Tp).reshape(shape) * self._F(Tp, Egamma)
 
         if self.nuclear_enhancement:
-            diffsigma *= self._nuclear_factor(Tp)
+            diffsigma *= self._nuclear_factor(Tp).reshape(shape)
 
         return diffsigma
 
@@ -1582,16 +1641,16 @@ class PionDecay(BaseProton):
         else:
             self.diffsigma = self._diffsigma
 
-        Egamma = _validate_ene(photon_energy).to("GeV")
-        Ep = self._Ep * u.GeV
-        J = self._J * u.Unit("1/GeV")
+        Egamma = np.atleast_1d(_validate_ene(photon_energy).to("GeV").value)
+        Ep = self._Ep
+        J = self._J
 
-        specpp = []
-        for Eg in Egamma:
-            diffsigma = self.diffsigma(Ep.value, Eg.value) * u.Unit("cm2/GeV")
-            specpp.append(trapz_loglog(diffsigma * J, Ep))
+        # Differential cross section for all gamma-ray energies at once, with
+        # shape (Ep.size, Egamma.size), integrated along the proton axis
+        diffsigma = self.diffsigma(Ep, Egamma)
+        specpp = trapz_loglog(diffsigma * J[:, None], Ep, axis=0)
 
-        self.specpp = u.Quantity(specpp)
+        self.specpp = specpp * u.Unit("cm2/GeV")
 
         self.specpp *= self.nh * c.cgs
 
@@ -1599,7 +1658,21 @@ class PionDecay(BaseProton):
 
 
 def heaviside(x):
-    return (np.sign(x) + 1) / 2.0
+    # A comparison mask is several times faster than np.sign or np.heaviside,
+    # and the value at x=0 is irrelevant for the thresholds where it is used
+    return np.greater(x, 0).astype(float)
+
+
+def _gauss_legendre_unit(n):
+    """Gauss-Legendre nodes and weights for integration over [0, 1]"""
+    nodes, weights = np.polynomial.legendre.leggauss(n)
+    return (nodes + 1) / 2, weights / 2
+
+
+# Nodes and weights for the fixed-order quadrature of PionDecayKelner06, the
+# lower order rule is used to detect energies where it has not converged
+_GL20 = _gauss_legendre_unit(20)
+_GL40 = _gauss_legendre_unit(40)
 
 
 class PionDecayKelner06(BaseRadiative):
@@ -1626,6 +1699,24 @@ class PionDecayKelner06(BaseRadiative):
         approximation is used for the spectral calculation, and the full
         calculation is used at higher energies. Default is 0.1 TeV.
 
+    fixed_quad : bool
+        Whether to use a fixed-order Gauss-Legendre quadrature for the full
+        calculation above ``Etrans`` instead of adaptive quadrature. It is an
+        order of magnitude faster, and energies at which it has not converged
+        are recomputed with adaptive quadrature. Default is False.
+
+    threads : int
+        Number of parallel processes (not threads) among which the photon
+        energies are split for the spectral calculation. The particle
+        distribution must be picklable to use more than one process. Default
+        is None, which computes the spectrum serially.
+
+    vectorized_particle_distribution : bool
+        Whether the particle distribution function accepts arrays of
+        energies. Set it to False for functions that only accept scalar
+        energies, which are then evaluated one energy at a time through
+        `numpy.vectorize`. Default is True.
+
     References
     ----------
     Kelner, S.R., Aharonian, F.A., and Bugayov, V.V., 2006 PhysRevD 74, 034018
@@ -1634,7 +1725,7 @@ class PionDecayKelner06(BaseRadiative):
     """
 
     # This class doesn't inherit from BaseProton
-    param_names = ["nh", "Etrans"]
+    param_names = ["nh", "Etrans", "fixed_quad"]
     _memoize = True
     _cache = {}
     _queue = []
@@ -1651,11 +1742,18 @@ class PionDecayKelner06(BaseRadiative):
         self.Etrans = validate_scalar(
             "Etrans", Etrans, domain="positive", physical_type="energy"
         )
+        self.fixed_quad = False
+        self.threads = None
+        self.vectorized_particle_distribution = True
+        self._nhat_cache = {}
 
         self.__dict__.update(**kwargs)
 
     def _particle_distribution(self, E):
-        return self.particle_distribution(E * u.TeV).to("1/TeV").value
+        if self.vectorized_particle_distribution or np.ndim(E) == 0:
+            return self.particle_distribution(E * u.TeV).to("1/TeV").value
+        else:
+            return np.vectorize(self._particle_distribution, otypes=[float])(E)
 
     def _Fgamma(self, x, Ep):
         """
@@ -1693,20 +1791,21 @@ class PionDecayKelner06(BaseRadiative):
 
         Parameters
         ----------
-        Ep : float
+        Ep : float or array
             Eprot [TeV]
 
         Returns
         -------
-        sigma_inel : float
+        sigma_inel : float or array
             Inelastic cross-section for p-p interaction [1/cm2].
 
         """
         L = np.log(Ep)
         sigma = 34.3 + 1.88 * L + 0.25 * L ** 2
-        if Ep <= 0.1:
-            Eth = 1.22e-3
-            sigma *= (1 - (Eth / Ep) ** 4) ** 2 * heaviside(Ep - Eth)
+        # threshold behaviour only applies below 0.1 TeV
+        Eth = 1.22e-3
+        threshold = (1 - (Eth / Ep) ** 4) ** 2 * heaviside(Ep - Eth)
+        sigma *= np.where(Ep <= 0.1, threshold, 1.0)
         return sigma * 1e-27  # convert from mbarn to cm2
 
     def _photon_integrand(self, x, Egamma):
@@ -1726,30 +1825,66 @@ class PionDecayKelner06(BaseRadiative):
     def _calc_specpp_hiE(self, Egamma):
         """
         Spectrum computed as in Eq. 42 for Egamma >= 0.1 TeV
+
+        Egamma is an array of gamma-ray energies in TeV, and the spectrum is
+        returned in units of 1/(s TeV).
+        """
+        if self.fixed_quad:
+            return self._calc_specpp_hiE_fixed(Egamma)
+        else:
+            return self._calc_specpp_hiE_quad(Egamma)
+
+    def _calc_specpp_hiE_quad(self, Egamma):
+        """
+        Spectrum computed as in Eq. 42 with adaptive quadrature
         """
-        # Fixed quad with n=40 is about 15 times faster and is always within
-        # 0.5% of the result of adaptive quad for Egamma>0.1
-        # WARNING: It also produces artifacts for steep distributions (e.g.
-        # Maxwellian) at ~500 GeV. Reverting to adaptative quadrature
-        # from scipy.integrate import fixed_quad
-        # result=c*fixed_quad(self._photon_integrand, 0., 1., args = [Egamma,
-        # ], n = 40)[0]
         from scipy.integrate import quad
 
-        Egamma = Egamma.to("TeV").value
-        specpp = (
-            c.cgs.value
-            * quad(
+        specpp = [
+            quad(
                 self._photon_integrand,
                 0.0,
                 1.0,
-                args=Egamma,
+                args=Eg,
                 epsrel=1e-3,
                 epsabs=0,
             )[0]
-        )
+            for Eg in Egamma
+        ]
+
+        return self._c * np.array(specpp)
 
-        return specpp * u.Unit("1/(s TeV)")
+    def _calc_specpp_hiE_fixed(self, Egamma):
+        """
+        Spectrum computed as in Eq. 42 with Gauss-Legendre quadrature of order
+        40, evaluating the integrand for all energies at once.
+
+        Fixed quad with n=40 is within 0.5% of the result of adaptive quad
+        for Egamma>0.1, but it produces artifacts for steep distributions
+        (e.g. Maxwellian) at ~500 GeV. The energies where the results of
+        orders 20 and 40 differ by more than 1% are recomputed with adaptive
+        quadrature.
+        """
+        Egamma = np.asarray(Egamma, dtype=float)
+
+        # evaluate the particle distribution only once for both orders
+        nodes = np.concatenate([_GL20[0], _GL40[0]])
+        x, Eg = np.broadcast_arrays(nodes[:, None], Egamma)
+        integrand = self._photon_integrand(x.ravel(), Eg.ravel())
+        integrand = integrand.reshape(x.shape)
+
+        n20 = len(_GL20[0])
+        spec20 = _GL20[1].dot(integrand[:n20])
+        spec40 = _GL40[1].dot(integrand[n20:])
+
+        unconverged = ~np.isclose(spec20, spec40, rtol=1e-2, atol=0)
+        spec40 *= self._c
+        if np.any(unconverged):
+            spec40[unconverged] = self._calc_specpp_hiE_quad(
+                Egamma[unconverged]
+            )
+
+        return spec40
 
     # variables for delta integrand
     _c = c.cgs.value
@@ -1770,20 +1905,63 @@ class PionDecayKelner06(BaseRadiative):
     def _calc_specpp_loE(self, Egamma):
         """
         Delta-functional approximation for low energies Egamma < 0.1 TeV
+
+        Egamma is an array of gamma-ray energies in TeV, and the spectrum is
+        returned in units of 1/(s TeV).
         """
         from scipy.integrate import quad
 
-        Egamma = Egamma.to("TeV").value
+        Egamma = np.asarray(Egamma)
         Epimin = Egamma + self._m_pi ** 2 / (4 * Egamma)
 
-        result = (
-            2
-            * quad(
-                self._delta_integrand, Epimin, np.inf, epsrel=1e-3, epsabs=0
-            )[0]
-        )
+        result = [
+            quad(self._delta_integrand, Emin, np.inf, epsrel=1e-3, epsabs=0)[0]
+            for Emin in Epimin
+        ]
+
+        return 2 * np.array(result)
+
+    def _map_energies(self, func, Egamma):
+        """
+        Evaluate func on the array of gamma-ray energies Egamma, splitting it
+        in chunks among ``threads`` processes if requested.
+        """
+        if self.threads is None or self.threads < 2 or len(Egamma) < 2:
+            return func(Egamma)
 
-        return result * u.Unit("1/(s TeV)")
+        chunks = np.array_split(Egamma, min(self.threads, len(Egamma)))
+
+        pool = Pool(len(chunks))
+        try:
+            results = pool.map(func, chunks)
+        finally:
+            pool.close()
+            pool.terminate()
+
+        return np.concatenate(results)
+
+    def _calc_nhat(self):
+        """
+        Compute value of nhat so that the delta functional approximation
+        matches the accurate calculation at Etrans. The result is cached for
+        the current values of Etrans and the particle distribution parameters.
+        """
+        key = self._particle_distribution_key()
+        if key is not None:
+            key += (self.Etrans.to("TeV").value, self.fixed_quad)
+            if key in self._nhat_cache:
+                return self._nhat_cache[key]
+
+        self.nhat = 1.0
+        Etrans = [self.Etrans.to("TeV").value]
+        full = self._calc_specpp_hiE(Etrans)[0]
+        delta = self._calc_specpp_loE(Etrans)[0]
+        nhat = full / delta
+
+        if key is not None:
+            self._nhat_cache = {key: nhat}
+
+        return nhat
 
     @property
     def Wp(self):
@@ -1824,17 +2002,20 @@ class PionDecayKelner06(BaseRadiative):
             ):
                 # compute value of nhat so that delta functional matches
                 # accurate calculation at 0.1TeV
-                full = self._calc_specpp_hiE(self.Etrans)
-                delta = self._calc_specpp_loE(self.Etrans)
-                self.nhat *= (full / delta).decompose().value
+                self.nhat = self._calc_nhat()
 
-            self.specpp = np.zeros(len(outspecene)) * u.Unit("1/(s TeV)")
+            Egamma = np.atleast_1d(outspecene.to("TeV").value)
+            hiE = Egamma >= self.Etrans.to("TeV").value
 
-            for i, Egamma in enumerate(outspecene):
-                if Egamma >= self.Etrans:
-                    self.specpp[i] = self._calc_specpp_hiE(Egamma)
-                else:
-                    self.specpp[i] = self._calc_specpp_loE(Egamma)
+            specpp = np.zeros(Egamma.shape)
+            specpp[hiE] = self._map_energies(
+                self._calc_specpp_hiE, Egamma[hiE]
+            )
+            specpp[~hiE] = self._map_energies(
+                self._calc_specpp_loE, Egamma[~hiE]
+            )
+
+            self.specpp = specpp * u.Unit("1/(s TeV)")
 
         density_factor = (self.nh / (1 * u.Unit("1/cm3"))).decompose().value
 
@@ -1854,7 +2035,8 @@ class LookupTable:
 
     The instantiated object can be called with arguments (x,y), and the
     interpolated value of z will be returned. The interpolation is done through
-    a cubic spline in semi-logarithmic space.
+    a cubic spline in semi-logarithmic space. If y is an array, z is evaluated
+    on the (x, y) grid and has shape (x.size, y.size).
     """
 
     def __init__(self, filename):
@@ -1868,7 +2050,15 @@ class LookupTable:
         self.fname = filename
 
     def __call__(self, X, Y):
-        return self.int_lut(np.log10(X), np.log10(Y)).flatten()
+        if np.ndim(Y) == 0:
+            return self.int_lut(np.log10(X), np.log10(Y)).flatten()
+
+        # The spline grid evaluation requires sorted coordinates
+        logY = np.log10(Y)
+        order = np.argsort(logY)
+        Z = np.empty((np.size(X), np.size(Y)))
+        Z[:, order] = self.int_lut(np.log10(X), logY[order])
+        return Z
 
 
 def _calc_lut_pp(args):  # pragma: no cover
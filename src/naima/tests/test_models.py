@@ -180,6 +180,27 @@ def test_set_We(particle_dists):
         pp.set_Wp(W, amplitude_name="norm")
 
 
+@pytest.mark.skipif("not HAS_SCIPY")
+def test_electron_grid_cache():
+    """
+    test cached electron distribution follows changes in the model parameters
+    """
+    PL = PowerLaw(1 / u.eV, 1 * u.TeV, 2.0)
+    sy = Synchrotron(PL, **electron_properties)
+    sy.flux(energy)
+
+    PL.alpha = 2.5
+    sy_new = Synchrotron(
+        PowerLaw(1 / u.eV, 1 * u.TeV, 2.5), **electron_properties
+    )
+    assert_allclose(sy.flux(energy), sy_new.flux(energy))
+    assert_allclose(sy.We, sy_new.We)
+
+    sy.Eemax = 100 * u.TeV
+    sy_new = Synchrotron(PL, Eemin=100 * u.GeV, Eemax=100 * u.TeV)
+    assert_allclose(sy.flux(energy), sy_new.flux(energy))
+
+
 @pytest.mark.skipif("not HAS_SCIPY")
 def test_bremsstrahlung_lum(particle_dists):
     """
@@ -231,6 +252,29 @@ def test_inverse_compton_lum(particle_dists):
     assert_allclose(lic.value, 0.0005833030059049264)
 
 
+@pytest.mark.skipif("not HAS_SCIPY")
+def test_inverse_compton_seed_changes(particle_dists):
+    """
+    test IC follows changes in the seed photon fields after initialization
+    """
+
+    ECPL, PL, BPL = particle_dists
+
+    ic = InverseCompton(ECPL, seed_photon_fields=["FIR"])
+    ic.flux(energy)
+    ic.seed_photon_fields["FIR"]["T"] *= 2
+    ic.seed_photon_fields["FIR"]["u"] *= 3
+
+    ic_new = InverseCompton(
+        ECPL, seed_photon_fields=[["FIR", 60 * u.K, 1.5 * u.eV / u.cm ** 3]]
+    )
+    assert_allclose(ic.flux(energy), ic_new.flux(energy))
+
+    # named seed photon fields are not shared between instances
+    ic_fir = InverseCompton(ECPL, seed_photon_fields=["FIR"])
+    assert ic_fir.seed_photon_fields["FIR"]["T"] == 30 * u.K
+
+
 @pytest.mark.skipif("not HAS_SCIPY")
 def test_anisotropic_inverse_compton_lum(particle_dists):
     """
@@ -449,6 +493,21 @@ def test_pion_decay(particle_dists):
     pp.flux(energy, 0)
 
 
+@pytest.mark.skipif("not HAS_SCIPY")
+def test_pion_decay_unsorted_energies(particle_dists):
+    """
+    test PionDecay spectrum does not depend on the photon energy ordering
+    """
+
+    ECPL, PL, BPL = particle_dists
+
+    energy = np.logspace(-3, 3, 20) * u.TeV
+    for useLUT in [True, False]:
+        pp = PionDecay(PL, useLUT=useLUT, **proton_properties)
+        sed = pp.sed(energy)
+        assert_allclose(pp.sed(energy[::-1])[::-1], sed)
+
+
 @pytest.mark.skipif("not HAS_SCIPY")
 def test_pion_decay_no_nuc_enh(particle_dists):
     """
@@ -495,6 +554,79 @@ def test_pion_decay_kelner(particle_dists):
     assert_allclose(lpp, lum_ref)
 
 
+@pytest.mark.skipif("not HAS_SCIPY")
+def test_pion_decay_kelner_nhat_cache():
+    """
+    test PionDecayKelner06 delta functional normalization follows changes in
+    the particle distribution
+    """
+
+    PL = PowerLaw(1 / u.TeV, 1 * u.TeV, 2.0)
+    energy = np.logspace(10, 12, 5) * u.eV
+
+    pp = PionDecayKelner06(PL)
+    pp.flux(energy)
+    PL.alpha = 2.5
+    flux = pp.flux(energy)
+
+    pp_new = PionDecayKelner06(PowerLaw(1 / u.TeV, 1 * u.TeV, 2.5))
+    assert_allclose(flux, pp_new.flux(energy))
+
+
+@pytest.mark.skipif("not HAS_SCIPY")
+def test_pion_decay_kelner_fixed_quad():
+    """
+    test PionDecayKelner06 fixed-order quadrature against adaptive quadrature
+    for both smooth and steep particle distributions
+    """
+
+    energy = np.logspace(-2, 3, 30) * u.TeV
+
+    ECPL = ExponentialCutoffPowerLaw(1 / u.TeV, 1 * u.TeV, 2.1, 100 * u.TeV)
+    ECPL_steep = ExponentialCutoffPowerLaw(
+        1 / u.TeV, 1 * u.TeV, 1.5, 1 * u.TeV, beta=2
+    )
+
+    for pdist in [ECPL, ECPL_steep]:
+        pp = PionDecayKelner06(pdist)
+        pp_fixed = PionDecayKelner06(pdist, fixed_quad=True)
+        assert_allclose(pp_fixed.flux(energy), pp.flux(energy), rtol=5e-3)
+
+
+@pytest.mark.skipif("not HAS_SCIPY")
+def test_pion_decay_kelner_scalar_pdist():
+    """
+    test PionDecayKelner06 with a particle distribution that only accepts
+    scalar energies
+    """
+
+    ECPL = ExponentialCutoffPowerLaw(1 / u.TeV, 1 * u.TeV, 2.1, 100 * u.TeV)
+    energy = np.logspace(-2, 2, 10) * u.TeV
+
+    def scalar_pdist(E):
+        return float(ECPL(E).to("1/TeV").value) / u.TeV
+
+    pp = PionDecayKelner06(ECPL, fixed_quad=True)
+    pp_scalar = PionDecayKelner06(
+        scalar_pdist, fixed_quad=True, vectorized_particle_distribution=False
+    )
+    assert_allclose(pp_scalar.flux(energy), pp.flux(energy))
+
+
+@pytest.mark.skipif("not HAS_SCIPY")
+def test_pion_decay_kelner_threads():
+    """
+    test PionDecayKelner06 spectrum computed in parallel processes
+    """
+
+    ECPL = ExponentialCutoffPowerLaw(1 / u.TeV, 1 * u.TeV, 2.1, 100 * u.TeV)
+    energy = np.logspace(-2, 2, 10) * u.TeV
+
+    pp = PionDecayKelner06(ECPL)
+    pp_threads = PionDecayKelner06(ECPL, threads=2)
+    assert_allclose(pp_threads.flux(energy), pp.flux(energy))
+
+
 def test_inputs():
     """ test input validation with LogParabola and ExponentialCutoffBrokenPowerLaw
     """
@@ -10,6 +10,7 @@ from ..utils import (
     build_data_table,
     estimate_B,
     generate_energy_edges,
+    trapz_loglog,
     validate_data_table,
 )
 
@@ -161,3 +162,24 @@ def test_estimate_B():
     B = estimate_B(xray, data_table)
 
     assert_allclose(B.to("uG"), 0.4848756912803697 * u.uG)
+
+
+def test_trapz_loglog():
+    x = np.logspace(0, 3, 7) * u.TeV
+
+    # integration of power laws is exact, including the index -1 case
+    for index in [-2.5, -1, 0, 1.5]:
+        y = x.value ** index / u.TeV
+        ref = (
+            (x[-1].value ** (index + 1) - 1) / (index + 1)
+            if index != -1
+            else np.log(1e3)
+        )
+        assert_allclose(trapz_loglog(y, x), ref)
+
+    # zero bins do not contribute, and axis selection works on 2D arrays
+    y = np.vstack([x.value ** -2, np.zeros(x.size)])
+    assert_allclose(trapz_loglog(y, x.value, axis=1), [1 - 1e-3, 0])
+    assert_allclose(
+        trapz_loglog(y.T, x.value, axis=0), trapz_loglog(y, x.value)
+    )
@@ -1,7 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
 import ast
-import warnings
 
 import astropy.units as u
 import numpy as np
@@ -336,21 +335,17 @@ def trapz_loglog(y, x, axis=-1, intervals=False):
         shape[axis] = x.shape[0]
         x = x.reshape(shape)
 
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
+    with np.errstate(all="ignore"):
         # Compute the power law indices in each integration bin
-        b = np.log10(y[slice2] / y[slice1]) / np.log10(x[slice2] / x[slice1])
+        logx = np.log(x[slice2] / x[slice1])
+        b = np.log(y[slice2] / y[slice1]) / logx
 
         # if local powerlaw index is -1, use \int 1/x = log(x); otherwise use
-        # normal powerlaw integration
+        # normal powerlaw integration, where (x2/x1)**b is simply y2/y1
         trapzs = np.where(
             np.abs(b + 1.0) > 1e-10,
-            (
-                y[slice1]
-                * (x[slice2] * (x[slice2] / x[slice1]) ** b - x[slice1])
-            )
-            / (b + 1),
-            x[slice1] * y[slice1] * np.log(x[slice2] / x[slice1]),
+            (x[slice2] * y[slice2] - x[slice1] * y[slice1]) / (b + 1),
+            x[slice1] * y[slice1] * logx,
         )
 
     tozero = (y[slice1] == 0.0) + (y[slice2] == 0.0) + (x[slice1] == x[slice2])